@@ -1,62 +1,89 @@
-from dataclasses import dataclass
+from typing import Iterable, List
 
 from .config import CodeGenConfig
 from .pb import Instruction, Operation, ProgramBlock, Value
 
 
-@dataclass
 class RegisterFile:
-    sp: int
-    fp: int
-    ra: int
-    rv: int
+
+    def __init__(self, sp: int, fp: int, ra: int, rv: int) -> None:
+        self.sp = sp
+        self.fp = fp
+        self.ra = ra
+        self.rv = rv
+        self.sp_d = Value.direct(sp)
+        self.fp_d = Value.direct(fp)
+        self.ra_d = Value.direct(ra)
+        self.rv_d = Value.direct(rv)
+        self.sp_ind = Value.indirect(sp)
+        self.ra_ind = Value.indirect(ra)
+        self.saved = (self.sp_d, self.fp_d, self.ra_d)
 
 
 class ActivationsStack:
 
+    __slots__ = ('_config', '_pb', '_rf', '_ws', '_zero')
+
     def __init__(self, config: CodeGenConfig, pb: ProgramBlock, rf: RegisterFile) -> None:
         self._config = config
         self._pb = pb
         self._rf = rf
+        self._ws = config.word_size
+        self._zero = Value.immediate(0)
 
     def push(self, value: Value) -> None:
-        self._pb.append(Instruction(Operation.Assign,
-                        value, Value.indirect(self._rf.sp)))
-        self._pb.append(Instruction(Operation.Add,
-                        Value.direct(self._rf.sp),
-                        self._config.word_size,
-                        Value.direct(self._rf.sp)))
+        sp_direct = self._rf.sp_d
+        self._pb.extend((Instruction(Operation.Assign,
+                                     value, self._rf.sp_ind),
+                         Instruction(Operation.Add,
+                                     sp_direct, self._ws, sp_direct)))
+
+    def push_instructions(self, values: Iterable[Value]) -> List[Instruction]:
+        sp_direct, sp_indirect = self._rf.sp_d, self._rf.sp_ind
+        bump_sp = Instruction(Operation.Add, sp_direct, self._ws, sp_direct)
+        assigns = [Instruction(Operation.Assign, value, sp_indirect) for value in values]
+        instructions = [bump_sp] * (2 * len(assigns))
+        instructions[::2] = assigns
+        return instructions
+
+    def push_many(self, values: Iterable[Value]) -> None:
+        self._pb.extend(self.push_instructions(values))
 
     def pop(self, address: Value) -> None:
-        self._pb.append(Instruction(Operation.Sub,
-                        Value.direct(self._rf.sp),
-                        self._config.word_size,
-                        Value.direct(self._rf.sp)))
-        self._pb.append(Instruction(Operation.Assign,
-                        Value.indirect(self._rf.sp), address))
+        sp_direct = self._rf.sp_d
+        self._pb.extend((Instruction(Operation.Sub,
+                                     sp_direct, self._ws, sp_direct),
+                         Instruction(Operation.Assign,
+                                     self._rf.sp_ind, address)))
+
+    def pop_instructions(self, addresses: Iterable[Value]) -> List[Instruction]:
+        sp_direct, sp_indirect = self._rf.sp_d, self._rf.sp_ind
+        drop_sp = Instruction(Operation.Sub, sp_direct, self._ws, sp_direct)
+        assigns = [Instruction(Operation.Assign, sp_indirect, address) for address in addresses]
+        instructions = [drop_sp] * (2 * len(assigns))
+        instructions[1::2] = assigns
+        return instructions
 
     def create_scope(self) -> None:
-        self.push(self._rf.fp)
+        self.push(self._rf.fp_d)
         self._pb.append(Instruction(Operation.Assign,
-                        Value.direct(self._rf.sp),
-                        Value.direct(self._rf.fp)))
+                        self._rf.sp_d,
+                        self._rf.fp_d))
 
     def delete_scope(self) -> None:
         self._pb.append(Instruction(Operation.Assign,
-                        Value.direct(self._rf.fp),
-                        Value.direct(self._rf.sp)))
-        self.pop(self._rf.fp)
+                        self._rf.fp_d,
+                        self._rf.sp_d))
+        self.pop(self._rf.fp_d)
 
     def reserve(self, size: int) -> None:
-       for _ in range(size):
-            self.push(Value.immediate(0))
+        sp_direct, sp_indirect = self._rf.sp_d, self._rf.sp_ind
+        push_zero = Instruction(Operation.Assign, self._zero, sp_indirect)
+        bump_sp = Instruction(Operation.Add, sp_direct, self._ws, sp_direct)
+        self._pb.extend((push_zero, bump_sp) * size)
 
     def push_rf(self) -> None:
-        self.push(Value.direct(self._rf.sp))
-        self.push(Value.direct(self._rf.fp))
-        self.push(Value.direct(self._rf.ra))
+        self.push_many(self._rf.saved)
 
     def pop_rf(self) -> None:
-        self.pop(Value.direct(self._rf.ra))
-        self.pop(Value.direct(self._rf.fp))
-        self.pop(Value.direct(self._rf.sp))
+        self._pb.extend(self.pop_instructions(reversed(self._rf.saved)))
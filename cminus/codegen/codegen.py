@@ -1,5 +1,6 @@
 from enum import Enum
-from typing import Callable, Dict, List, Protocol
+from itertools import chain
+from typing import Callable, Dict, List, Tuple
 
 from .error_logger import CodeGenErrorLogger
 from ..scanner.symbol_table import IdType, SymbolTable
@@ -9,26 +10,10 @@ from .machine_state import MachineState
 from ..scanner.scanner import Token
 from .config import CodeGenConfig
 from .semantic_stack import SemanticStack
-from .pb import Instruction, ProgramBlock, Value, Operation
+from .pb import OPERATIONS, Instruction, ProgramBlock, Value, Operation
 
 
-class Routine(Protocol):
-    def __call__(self, codegen: 'CodeGenerator', token: Token = None) -> None: ...
-
-
-class Symbols:
-    symbols: Dict['ActionSymbol', Routine] = {}
-
-    @classmethod
-    def symbol(cls, symbol: 'ActionSymbol') -> Callable[[Routine], Routine]:
-        def _symbol(routine: Routine):
-            def wrapper(codegen: 'CodeGenerator', token: Token = None) -> None:
-                if routine.__code__.co_argcount == 2:
-                    return routine(codegen, token)
-                return routine(codegen)
-            cls.symbols[symbol] = wrapper
-            return wrapper
-        return _symbol
+OPERAND_TYPES = frozenset((IdType.Int, IdType.NotSpecified))
 
 
 class ActionSymbol(Enum):
@@ -76,13 +61,45 @@ class ActionSymbol(Enum):
         return f'#{self.value}'
 
 
+ACTION_INDEX: Dict[ActionSymbol, int] = {symbol: i for i, symbol in enumerate(ActionSymbol)}
+
+
+class Symbols:
+    symbols: List[Callable[..., None]] = [None] * len(ActionSymbol)
+    takes_token: List[bool] = [False] * len(ActionSymbol)
+
+    @classmethod
+    def symbol(cls, symbol: 'ActionSymbol') -> Callable[[Callable[..., None]], Callable[..., None]]:
+        def _symbol(routine: Callable[..., None]):
+            cls.symbols[ACTION_INDEX[symbol]] = routine
+            cls.takes_token[ACTION_INDEX[symbol]] = routine.__code__.co_argcount == 2
+            return routine
+        return _symbol
+
+    @classmethod
+    def routine_for(cls, symbol: 'ActionSymbol') -> Tuple[Callable[..., None], bool]:
+        """ Returns the routine bound to the symbol and whether it takes the lookahead token. """
+        index = ACTION_INDEX[symbol]
+        return cls.symbols[index], cls.takes_token[index]
+
+
 class CodeGenerator:
+    """ Emits the program block through the action routines.
+
+    The symbol table and error logger are bound once at construction, so a
+    generator must be created inside the CodeGenErrorLogger context of its
+    compilation and after SymbolTable.reset(), as Compiler.compile does.
+    """
     instance: 'CodeGenerator' = None
 
+    __slots__ = ('_config', '_pb', '_state', '_rf', '_as', '_scope', '_ss',
+                 '_emit', '_st', '_el', '_ws', '_stack_start', '_zero', '_debug')
+
     def __init__(self, config: CodeGenConfig) -> None:
         CodeGenerator.instance = self
         self._config = config
         self._pb = ProgramBlock()
+        self._emit = self._pb.append
         self._state = MachineState(config, self._pb)
         self._rf = RegisterFile(self._state.getvar(),
                                 self._state.getvar(),
@@ -91,6 +108,13 @@ class CodeGenerator:
         self._as = ActivationsStack(config, self._pb, self._rf)
         self._scope = ScopeManager(self._state, self._as)
         self._ss = SemanticStack()
+        self._st = SymbolTable.instance()
+        self._el = CodeGenErrorLogger.instance
+        assert self._el is not None, 'CodeGenerator must be created inside a CodeGenErrorLogger context'
+        self._ws = config.word_size
+        self._stack_start = Value.immediate(config.stack_start)
+        self._zero = Value.immediate(0)
+        self._debug = config.debug
 
     def export(self) -> str:
         """ Exports the program block to a string. """
@@ -99,12 +123,12 @@ class CodeGenerator:
     @Symbols.symbol(ActionSymbol.Output)
     def output(self) -> None:
         """ Implicit implementation of built-in output function. """
-        id_ = SymbolTable.instance().add_symbol('output', self._pb.i, force=True)
+        id_ = self._st.add_symbol('output', self._pb.i, force=True)
         id_.type = IdType.Function
         id_.args_type.append(IdType.Int)
-        self._as.pop(Value.direct(self._rf.rv))
-        self._pb.append(Instruction(Operation.Print, Value.direct(self._rf.rv)))
-        self._pb.append(Instruction(Operation.Jp, Value.indirect(self._rf.ra)))
+        self._as.pop(self._rf.rv_d)
+        self._emit(Instruction(Operation.Print, self._rf.rv_d))
+        self._emit(Instruction(Operation.Jp, self._rf.ra_ind))
 
     @Symbols.symbol(ActionSymbol.JpFrom)
     def jp_from(self) -> None:
@@ -115,16 +139,16 @@ class CodeGenerator:
     @Symbols.symbol(ActionSymbol.InitRf)
     def init_rf(self) -> None:
         """ Initializes register file. """
-        self._pb.append(Instruction(Operation.Assign,
-                        Value.immediate(self._config.stack_start),
-                        Value.direct(self._rf.sp)))
-        self._pb.append(Instruction(Operation.Assign,
-                        Value.immediate(self._config.stack_start),
-                        Value.direct(self._rf.fp)))
+        self._emit(Instruction(Operation.Assign,
+                        self._stack_start,
+                        self._rf.sp_d))
+        self._emit(Instruction(Operation.Assign,
+                        self._stack_start,
+                        self._rf.fp_d))
         self.hold() # for assigning the return address at #set_main_ra
-        self._pb.append(Instruction(Operation.Assign,
-                        Value.immediate(0),
-                        Value.direct(self._rf.rv)))
+        self._emit(Instruction(Operation.Assign,
+                        self._zero,
+                        self._rf.rv_d))
 
     @Symbols.symbol(ActionSymbol.Pid)
     def pid(self, token: Token) -> None:
@@ -133,12 +157,12 @@ class CodeGenerator:
         Args:
             token (Token): Id token.
         """
-        id_ = SymbolTable.instance().lookup(token.lexeme)
-        if id_ == None:
-            CodeGenErrorLogger.instance.log(token.lineno, f"'{token.lexeme}' is not defined.")
+        id_ = self._st.lookup(token.lexeme)
+        if id_ is None:
+            self._el.log(token.lineno, f"'{token.lexeme}' is not defined.")
             self._ss.push(Value.immediate(-1, IdType.NotSpecified), f'pid {token.lexeme} (undefined)')
         else:
-            self._ss.push(Value.direct(id_.address, id_.type), f'pid {token.lexeme}')
+            self._ss.push(Value.direct(id_.address, id_.type), f'pid {token.lexeme}' if self._debug else 'pid')
 
     @Symbols.symbol(ActionSymbol.Pnum)
     def pnum(self, token: Token) -> None:
@@ -152,7 +176,7 @@ class CodeGenerator:
     @Symbols.symbol(ActionSymbol.Prv)
     def prv(self) -> None:
         """ Pushes the return value to the semantic stack. """
-        self._ss.push(Value.direct(self._rf.rv), 'prv')
+        self._ss.push(self._rf.rv_d, 'prv')
 
     @Symbols.symbol(ActionSymbol.Parray)
     def parray(self) -> None:
@@ -161,8 +185,9 @@ class CodeGenerator:
         offset = self._ss.pop()
         base = self._ss.pop()
         t = self._state.gettemp()
-        self._pb.append(Instruction(Operation.Mult, self._config.word_size, offset, Value.direct(t)))
-        self._pb.append(Instruction(Operation.Add, base, Value.direct(t), Value.direct(t)))
+        t_direct = Value.direct(t)
+        self._emit(Instruction(Operation.Mult, self._ws, offset, t_direct))
+        self._emit(Instruction(Operation.Add, base, t_direct, t_direct))
         self._ss.push(Value.indirect(t, IdType.Int), 'parray')
 
     @Symbols.symbol(ActionSymbol.Ptype)
@@ -179,8 +204,8 @@ class CodeGenerator:
         """ Checks the type of the variable in the semantic stack to be int. """
         type_ = self._state.last_type
         token = self._state.last_id
-        if type_ != IdType.Int:
-            CodeGenErrorLogger.instance.log(token.lineno, f"Illegal type of {type_.value} for '{token.lexeme}'.")
+        if type_ is not IdType.Int:
+            self._el.log(token.lineno, f"Illegal type of {type_.value} for '{token.lexeme}'.")
 
     @Symbols.symbol(ActionSymbol.Pop)
     def pop(self) -> None:
@@ -191,35 +216,38 @@ class CodeGenerator:
     def declare_array(self) -> None:
         """ Declares an array and reserves memory for it. """
         size = self._ss.pop().value
-        base = self._ss.from_top()
-        self._pb.append(Instruction(Operation.Assign,
-                        Value.direct(self._rf.sp), base))                        
+        base = self._ss.top()
+        self._emit(Instruction(Operation.Assign,
+                        self._rf.sp_d, base))                        
         self._as.reserve(size)
-        SymbolTable.instance().lookup_by_address(base.value).type = IdType.Array
+        self._st.lookup_by_address(base.value).type = IdType.Array
 
     @Symbols.symbol(ActionSymbol.ArrayType)
     def array_type(self) -> None:
         """ Sets the argument type to array """
-        SymbolTable.instance().lookup(self._state.last_id.lexeme).type = IdType.Array
-        SymbolTable.instance().lookup(self._state.last_function_name).args_type[-1] = IdType.Array
+        self._st.lookup(self._state.last_id.lexeme).type = IdType.Array
+        self._st.lookup(self._state.last_function_name).args_type[-1] = IdType.Array
 
     @Symbols.symbol(ActionSymbol.DeclareFunction)
     def declare_function(self) -> None:
         """ Declares a function. """
-        self._state.data_pointer = self._state.data_address
-        self._state.temp_pointer = self._state.temp_address
-        self._state.last_function_name = self._state.last_id.lexeme
+        state, pb = self._state, self._pb
+        state.data_pointer = state.data_address
+        state.temp_pointer = state.temp_address
+        name = state.last_function_name = state.last_id.lexeme
 
-        if self._state.set_exec:
-            self._pb.i -= 1
+        i = pb.i
+        if state.set_exec:
+            i -= 1
+            pb.i = i
 
-        id_ = SymbolTable.instance().lookup(self._state.last_id.lexeme)
+        id_ = self._st.lookup(name)
         id_.type, id_.return_type = IdType.Function, id_.type
-        id_.address = self._pb.i
+        id_.address = i
 
-        if not self._state.set_exec:
-            self._state.set_exec = True
-            self._pb.i -= 1
+        if not state.set_exec:
+            state.set_exec = True
+            pb.i = i - 1
             function, description = self._ss.pop(return_description=True)
             self.hold() # jump to main before 1st function at #exec_main
             self._ss.push(function, description)
@@ -227,7 +255,7 @@ class CodeGenerator:
     @Symbols.symbol(ActionSymbol.CaptureParamType)
     def capture_param_type(self) -> None:
         """ Counts the parameters of the function. """
-        SymbolTable.instance().lookup(self._state.last_function_name).args_type.append(self._state.last_type)
+        self._st.lookup(self._state.last_function_name).args_type.append(self._state.last_type)
 
     @Symbols.symbol(ActionSymbol.DeclareId)
     def declare_id(self, token: Token) -> None:
@@ -236,29 +264,30 @@ class CodeGenerator:
         Args:
             token (Token): Id token.
         """
-        id_ = SymbolTable.instance().lookup(token.lexeme)
+        id_ = self._st.lookup(token.lexeme)
         id_.address = self._state.getvar()
         id_.type = self._state.last_type
         self._state.last_id = token
 
+        address = Value.direct(id_.address)
         if self._state.declaring_args:
-            self._as.pop(Value.direct(id_.address))
+            self._as.pop(address)
         else:
-            self._pb.append(Instruction(Operation.Assign,
-                            Value.immediate(0),
-                            Value.direct(id_.address)))
+            self._emit(Instruction(Operation.Assign,
+                            self._zero,
+                            address))
 
     @Symbols.symbol(ActionSymbol.Declare)
     def declare(self) -> None:
         """ Enable declaring mode. """
-        SymbolTable.instance().declaring = True
+        self._st.declaring = True
 
     @Symbols.symbol(ActionSymbol.Assign)
     def assign(self) -> None:
         """ Assigns the value from the semantic stack to the id. """
-        self._pb.append(Instruction(Operation.Assign,
+        self._emit(Instruction(Operation.Assign,
                         self._ss.pop(),
-                        self._ss.from_top()))
+                        self._ss.top()))
 
     @Symbols.symbol(ActionSymbol.OpExec)
     def op_exec(self, token: Token) -> None:
@@ -266,13 +295,15 @@ class CodeGenerator:
         arg2 = self._ss.pop()
         op: Operation = self._ss.pop()
         arg1 = self._ss.pop()
-        for arg in [arg1, arg2]:
-            if arg.type not in [IdType.Int, IdType.NotSpecified]:
-                CodeGenErrorLogger.instance.log(
-                    token.lineno, f"Type mismatch in operands, Got {arg.type.value} instead of int.")            
+        if arg1.type not in OPERAND_TYPES:
+            self._el.log(
+                token.lineno, f"Type mismatch in operands, Got {arg1.type.value} instead of int.")
+        if arg2.type not in OPERAND_TYPES:
+            self._el.log(
+                token.lineno, f"Type mismatch in operands, Got {arg2.type.value} instead of int.")
         t = Value.direct(self._state.gettemp(), IdType.Int)
-        self._pb.append(Instruction(op, arg1, arg2, t))
-        self._ss.push(t, f'op_exec {op}')
+        self._emit(Instruction(op, arg1, arg2, t))
+        self._ss.push(t, f'op_exec {op.name}' if self._debug else 'op_exec')
 
     @Symbols.symbol(ActionSymbol.OpPush)
     def op_push(self, token: Token) -> None:
@@ -281,14 +312,15 @@ class CodeGenerator:
         Args:
             token (Token): Operator symbol token.
         """
-        self._ss.push(Operation.from_symbol(token.lexeme), f'op_push {token.lexeme}')
+        self._ss.push(OPERATIONS[token.lexeme], f'op_push {token.lexeme}' if self._debug else 'op_push')
 
     @Symbols.symbol(ActionSymbol.Hold)
     def hold(self) -> None:
         """ Pushes the current program counter to the semantic stack
         and skips the next instruction. """
-        self.label()
-        self._pb.i += 1
+        i = self._pb.i
+        self._ss.push(Value.direct(i), 'label')
+        self._pb.i = i + 1
 
     @Symbols.symbol(ActionSymbol.Label)
     def label(self) -> None:
@@ -308,7 +340,7 @@ class CodeGenerator:
         """ Unconditional jump to the holden line, for repeat-until. """
         condition = self._ss.pop()
         label = self._ss.pop()
-        self._pb.append(Instruction(Operation.Jpf, condition, label))
+        self._emit(Instruction(Operation.Jpf, condition, label))
 
     @Symbols.symbol(ActionSymbol.FunctionCall)
     def function_call(self, token: Token) -> None:
@@ -323,63 +355,59 @@ class CodeGenerator:
         Args:
             token (Token): Function call token.
         """
-        self.store()
-        args_type = self.push_args()
+        instructions = self.store()
+        args = self.pop_args()
+        instructions += self._as.push_instructions(args)
+        args_type = [arg.type for arg in reversed(args)]
         instno = self._ss.pop()
-        fid = SymbolTable.instance().lookup_by_instno(instno.value)
+        fid = self._st.lookup_by_instno(instno.value)
         if len(args_type) != len(fid.args_type):
-            CodeGenErrorLogger.instance.log(
+            self._el.log(
                 token.lineno, f"Mismatch in numbers of arguments of '{fid.lexeme}'.")
         arglen = min(len(args_type), len(fid.args_type))
         for i, (actual_type, expected_type) in enumerate(zip(args_type[:arglen], fid.args_type[:arglen])):
-            if actual_type not in [expected_type, IdType.NotSpecified]:
-                CodeGenErrorLogger.instance.log(
+            if actual_type is not expected_type and actual_type is not IdType.NotSpecified:
+                self._el.log(
                     token.lineno, f"Mismatch in type of argument "
                     f"{i + 1} of '{fid.lexeme}'. Expected '{expected_type.value}' but "
                     f"got '{actual_type.value}' instead.")
-        self._pb.append(Instruction(Operation.Assign,
-                        Value.immediate(self._pb.i + 2),
-                        Value.direct(self._rf.ra)))
-        self._pb.append(Instruction(Operation.Jp, instno))
-        self.restore()
+        instructions.append(Instruction(Operation.Assign,
+                            Value.immediate(self._pb.i + len(instructions) + 2),
+                            self._rf.ra_d))
+        instructions.append(Instruction(Operation.Jp, instno))
+        instructions += self.restore()
+        self._pb.extend(instructions)
         self.collect(fid.return_type)
 
-    def store(self) -> None:
-        """ Stores the current frame data and registers. """
-        for address in range(self._state.data_pointer, self._state.data_address, self._config.word_size.value):
-            self._as.push(Value.direct(address))
-        for address in range(self._state.temp_pointer, self._state.temp_address, self._config.word_size.value):
-            self._as.push(Value.direct(address))
-        self._as.push_rf()
-
-    def push_args(self) -> List[IdType]:
-        """ Pushes the arguments to the stack. """
-        args_type = []
-        for _ in range(self._ss.length - self._state.arg_pointer.pop()):
-            arg = self._ss.pop()
-            args_type.append(arg.type)
-            self._as.push(arg)
-        return args_type[::-1]
-
-    def restore(self) -> None:
-        """ Restores the frame data and registers. """
-        self._as.pop_rf()
-        for address in range(self._state.temp_address, self._state.temp_pointer, -self._config.word_size.value):
-            self._as.pop(Value.direct(address - self._config.word_size.value))
-        for address in range(self._state.data_address, self._state.data_pointer, -self._config.word_size.value):
-            self._as.pop(Value.direct(address - self._config.word_size.value))
+    def store(self) -> List[Instruction]:
+        """ Builds the instructions storing the current frame data and registers. """
+        state = self._state
+        return self._as.push_instructions(chain(
+            state.frame_data(), state.frame_temps(), self._rf.saved))
+
+    def pop_args(self) -> List[Value]:
+        """ Pops the arguments from the semantic stack, last argument first. """
+        return self._ss.pop_many(self._ss.length - self._state.arg_pointer.pop())
+
+    def restore(self) -> List[Instruction]:
+        """ Builds the instructions restoring the frame data and registers. """
+        state = self._state
+        return self._as.pop_instructions(chain(
+            reversed(self._rf.saved),
+            reversed(state.frame_temps()),
+            reversed(state.frame_data())))
 
     def collect(self, return_type: IdType) -> None:
         """ Collects the return value. """
         t = Value.direct(self._state.gettemp(), return_type)
-        self._pb.append(Instruction(Operation.Assign,
-                        Value.direct(self._rf.rv), t))
+        self._emit(Instruction(Operation.Assign,
+                        self._rf.rv_d, t))
         self._ss.push(t, 'collect')
 
     @Symbols.symbol(ActionSymbol.FunctionReturn)
     def function_return(self) -> None:
         """ Returns from a function. """
-        self._pb.append(Instruction(Operation.Jp, Value.indirect(self._rf.ra)))
+        self._emit(Instruction(Operation.Jp, self._rf.ra_ind))
 
     @Symbols.symbol(ActionSymbol.ArgInit)
     def arg_init(self) -> None:
@@ -419,13 +447,13 @@ class CodeGenerator:
     @Symbols.symbol(ActionSymbol.ScopeStart)
     def scope_start(self) -> None:
         """ Starts the pushed scope type. """
-        SymbolTable.instance().create_scope()
+        self._st.create_scope()
         self._scope.create_scope()
 
     @Symbols.symbol(ActionSymbol.ScopeEnd)
     def scope_end(self) -> None:
         """ Ends the incoming scope type. """
-        SymbolTable.instance().delete_scope()
+        self._st.delete_scope()
         self._scope.delete_scope()
 
     @Symbols.symbol(ActionSymbol.Prison)
@@ -441,7 +469,7 @@ class CodeGenerator:
     @Symbols.symbol(ActionSymbol.ExecMain)
     def exec_main(self) -> None:
         """ Jumps from the reserved line at #declare_function to the main function. """
-        id_ = SymbolTable.instance().lookup('main')
+        id_ = self._st.lookup('main')
         line = self._ss.pop().value
         self._pb[line] = Instruction(Operation.Jp, Value.direct(id_.address))
 
@@ -451,7 +479,7 @@ class CodeGenerator:
         line = self._ss.pop().value
         self._pb[line] = Instruction(Operation.Assign,
                                      Value.immediate(self._pb.i),
-                                     Value.direct(self._rf.ra))
+                                     self._rf.ra_d)
 
     @Symbols.symbol(ActionSymbol.CheckInContainer)
     def check_in_container(self, token: Token) -> None:
@@ -461,4 +489,4 @@ class CodeGenerator:
             token (Token): The token.
         """
         if not self._scope.are_we_inside(ScopeType.Container):
-            CodeGenErrorLogger.instance.log(token.lineno, f"No 'repeat ... until' found for 'break'.")
+            self._el.log(token.lineno, f"No 'repeat ... until' found for 'break'.")
@@ -1,3 +1,6 @@
+from typing import List
+
+
 class CodeGenErrorLogger:
     instance: 'CodeGenErrorLogger' = None
 
@@ -6,6 +9,7 @@ class CodeGenErrorLogger:
         self.file_name = file_name
         self.log_file = None
         self.any_error = False
+        self._lines: List[str] = []
 
     def __enter__(self):
         self.log_file = open(self.file_name, 'w')
@@ -14,9 +18,10 @@ class CodeGenErrorLogger:
     def __exit__(self, exc_type, exc_val, exc_tb):
         if not self.any_error:
             self.log_file.write('The input program is semantically correct.\n')
+        else:
+            self.log_file.write(''.join(self._lines))
         self.log_file.close()
 
     def log(self, lineno: int, message: str) -> None:
-        formatted = f'#{lineno} : Semantic Error! {message}\n'
-        self.log_file.write(formatted)
+        self._lines.append(f'#{lineno} : Semantic Error! {message}\n')
         self.any_error = True
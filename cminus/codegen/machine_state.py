@@ -2,14 +2,20 @@ from typing import List
 
 from ..scanner.symbol_table import IdType
 from ..scanner.scanner import Token
-from .pb import ProgramBlock
+from .pb import ProgramBlock, Value
 from .config import CodeGenConfig
 
 
 class MachineState:
 
+    __slots__ = ('_config', '_word', 'data_address', 'temp_address', 'stack_address',
+                 'data_pointer', 'temp_pointer', 'arg_pointer', 'last_id',
+                 'last_type', 'last_function_name', 'declaring_args', 'pb',
+                 'set_exec', '_data_directs', '_temp_directs')
+
     def __init__(self, config: CodeGenConfig, pb: ProgramBlock) -> None:
         self._config = config
+        self._word = config.word_size.value
         self.data_address = config.data_start
         self.temp_address = config.temp_start
         self.stack_address = config.stack_start
@@ -22,13 +28,32 @@ class MachineState:
         self.declaring_args: bool = False
         self.pb = pb
         self.set_exec = False
+        self._data_directs: List[Value] = []
+        self._temp_directs: List[Value] = []
 
     def getvar(self, size: int = 1) -> int:
         address = self.data_address
-        self.data_address += size * self._config.word_size.value
+        self.data_address = address + size * self._word
         return address
 
     def gettemp(self) -> int:
         address = self.temp_address
-        self.temp_address += self._config.word_size.value
+        self.temp_address = address + self._word
         return address
+
+    def frame_data(self) -> List[Value]:
+        """ Direct operands of the current function's data addresses. """
+        return self._directs(self._data_directs, self._config.data_start,
+                             self.data_pointer, self.data_address)
+
+    def frame_temps(self) -> List[Value]:
+        """ Direct operands of the current function's temp addresses. """
+        return self._directs(self._temp_directs, self._config.temp_start,
+                             self.temp_pointer, self.temp_address)
+
+    def _directs(self, table: List[Value], base: int, start: int, stop: int) -> List[Value]:
+        word = self._word
+        end = base + len(table) * word
+        if stop > end:
+            table.extend(map(Value.direct, range(end, stop, word)))
+        return table[(start - base) // word:(stop - base) // word]
@@ -1,26 +1,25 @@
-from ctypes import Union
-from dataclasses import dataclass
-from enum import Enum
-from typing import Dict, List
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import lru_cache
+from typing import Dict, Iterable, List
 
 from ..scanner.symbol_table import IdType
 
 
-class Operation(Enum):
-    Add = 'ADD'
-    Mult = 'MULT'
-    Sub = 'SUB'
-    Eq = 'EQ'
-    Lt = 'LT'
-    Assign = 'ASSIGN'
-    Jpf = 'JPF'
-    Jp = 'JP'
-    Print = 'PRINT'
-    Empty = ''
+class Operation(IntEnum):
+    Add = 0
+    Mult = 1
+    Sub = 2
+    Eq = 3
+    Lt = 4
+    Assign = 5
+    Jpf = 6
+    Jp = 7
+    Print = 8
+    Empty = 9
 
-    @staticmethod
-    def from_symbol(symbol: str) -> 'Operation':
-        return OPERATIONS[symbol]
+
+_LABELS = ('ADD', 'MULT', 'SUB', 'EQ', 'LT', 'ASSIGN', 'JPF', 'JP', 'PRINT', '')
 
 
 OPERATIONS: Dict[str, Operation] = {
@@ -32,54 +31,81 @@ OPERATIONS: Dict[str, Operation] = {
 }
 
 
-@dataclass
+_DIRECT_CACHE: Dict[int, Dict[IdType, 'Value']] = {}
+
+
+@dataclass(frozen=True, slots=True)
 class Value:
     prefix: str = ''
     value: int = None
     type: IdType = IdType.NotSpecified
+    _str: str = field(default=None, init=False, repr=False, compare=False)
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def immediate(value: int, type: IdType = IdType.NotSpecified) -> 'Value':
         return Value('#', value, type=type)
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def indirect(value: int, type: IdType = IdType.NotSpecified) -> 'Value':
         return Value('@', value, type=type)
 
     @staticmethod
     def direct(value: int, type: IdType = IdType.NotSpecified) -> 'Value':
-        return Value(value=value, type=type)
+        by_type = _DIRECT_CACHE.get(value)
+        if by_type is None:
+            by_type = _DIRECT_CACHE[value] = {}
+        direct = by_type.get(type)
+        if direct is None:
+            direct = by_type[type] = Value(value=value, type=type)
+        return direct
 
     @staticmethod
     def empty() -> 'Value':
-        return Value()
+        return _EMPTY_VALUE
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, '_str', f'{self.prefix}{self.value if self.value is not None else ""}')
 
     def __repr__(self) -> str:
-        return f'{self.prefix}{self.value if self.value is not None else ""}'
+        return self._str
 
     def __str__(self) -> str:
-        return self.__repr__()
+        return self._str
 
 
-@dataclass
+_EMPTY_VALUE = Value()
+
+
+@dataclass(frozen=True, slots=True)
 class Instruction:
     op: Operation
     arg1: Value
     arg2: Value = Value.empty()
     arg3: Value = Value.empty()
+    _str: str = field(default=None, init=False, repr=False, compare=False)
 
     @staticmethod
     def empty() -> 'Instruction':
-        return Instruction(Operation.Empty, Value.empty())
+        return _HOLE
 
     def __repr__(self) -> str:
-        return f'({self.op.value}, {self.arg1}, {self.arg2}, {self.arg3})' if self.op != Operation.Empty else ''
+        if self._str is None:
+            # after syntax-error recovery the semantic stack can hand us a Value as op
+            label = _LABELS[self.op] if isinstance(self.op, Operation) else self.op.value
+            object.__setattr__(self, '_str', f'({label}, {self.arg1}, {self.arg2}, {self.arg3})'
+                               if self.op is not Operation.Empty else '')
+        return self._str
+
+
+_HOLE = Instruction(Operation.Empty, Value.empty())  # shared placeholder for reserved lines, replaced via __setitem__
 
 
 class ProgramBlock:
 
     def __init__(self) -> None:
-        self._instructions: List[Union[Instruction]] = []
+        self._instructions: List[Instruction] = []
 
     @property
     def i(self) -> int:
@@ -87,16 +113,19 @@ class ProgramBlock:
 
     @i.setter
     def i(self, value: int) -> None:
-        if value < self.i:
-            self._instructions = self._instructions[:value]
+        if value < len(self._instructions):
+            del self._instructions[value:]
         else:
-            self._instructions.extend([Instruction.empty() for _ in range(value - self.i)])
+            self._instructions.extend([_HOLE] * (value - len(self._instructions)))
 
     def append(self, value: Instruction) -> None:
         self._instructions.append(value)
 
+    def extend(self, values: Iterable[Instruction]) -> None:
+        self._instructions.extend(values)
+
     def __setitem__(self, index: int, value: Instruction) -> None:
         self._instructions[index] = value
 
     def __str__(self) -> str:
-        return '\n'.join([f'{i}\t{inst}' for i, inst in enumerate(self._instructions)])
+        return '\n'.join([f'{i}\t{inst!r}' for i, inst in enumerate(self._instructions)])
@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import IntEnum
 from typing import List
 
 from .pb import Instruction, Operation, Value
@@ -12,19 +12,20 @@ class Layer:
         self._data_stack: List[int] = []
         self._temp_stack: List[int] = []
         self._jail: List[int] = []
+        self._jail_sizes: List[int] = []
 
     def create_scope(self) -> None:
         self._temp_stack.append(self._state.temp_address)
         self._data_stack.append(self._state.data_address)
-        self._jail.append('|')
+        self._jail_sizes.append(len(self._jail))
 
     def delete_scope(self) -> None:
         self._state.data_address = self._data_stack.pop()
         self._state.temp_address = self._temp_stack.pop()
 
-        while self._jail[-1] != '|':
+        boundary = self._jail_sizes.pop()
+        while len(self._jail) > boundary:
             self.prison_break()
-        self._jail.pop()
 
     def are_we_inside(self) -> bool:
         return len(self._data_stack) > 0
@@ -39,32 +40,29 @@ class Layer:
         self._state.pb[prisoner] = Instruction(Operation.Jp, break_address)
 
 
-class ScopeType(Enum):
-    Function = 'function'
-    Temporary = 'temporary'
-    Simple = 'simple'
-    Container = 'container'
+class ScopeType(IntEnum):
+    Function = 0
+    Temporary = 1
+    Simple = 2
+    Container = 3
 
 
 class ScopeManager:
 
+    __slots__ = ('_state', '_as', '_delete', '_layers', '_types')
+
     def __init__(self, state: MachineState, as_: ActivationsStack) -> None:
         self._state = state
         self._as = as_
         self._delete = False
-        self._layers = {
-            ScopeType.Function: Layer(state),
-            ScopeType.Temporary: Layer(state),
-            ScopeType.Simple: Layer(state),
-            ScopeType.Container: Layer(state)
-        }
+        self._layers = [Layer(state) for _ in ScopeType]
         self._types: List[ScopeType] = []
 
     def push_type(self, type_: ScopeType) -> None:
         if self._delete:
             self._delete = False
             self._layers[type_].delete_scope()
-            if type_ == ScopeType.Function:
+            if type_ is ScopeType.Function:
                 self._as.delete_scope()
         else:
             self._types.append(type_)
@@ -81,7 +79,7 @@ class ScopeManager:
     def create_scope(self) -> None:
         type_ = self._types.pop()
         self._layers[type_].create_scope()
-        if type_ == ScopeType.Function:
+        if type_ is ScopeType.Function:
             self._as.create_scope()
 
     def delete_scope(self) -> None:
@@ -1,12 +1,10 @@
 
-from dataclasses import dataclass
-from typing import List, Union
+from typing import List, NamedTuple, Union
 
 from .pb import Operation, Value
 
 
-@dataclass
-class StackEntry:
+class StackEntry(NamedTuple):
     value: Union[Value, Operation]
     description: str = ''
 
@@ -20,23 +18,37 @@ class StackEntry:
 class SemanticStack:
 
     def __init__(self) -> None:
-        self._s: List[StackEntry] = []
+        self._values: List[Union[Value, Operation]] = []
+        self._descriptions: List[str] = []
+        self._push_value = self._values.append
+        self._push_description = self._descriptions.append
+        self._pop_value = self._values.pop
+        self._pop_description = self._descriptions.pop
 
     def push(self, item: Union[Value, Operation], description: str = '') -> None:
-        self._s.append(StackEntry(item, description))
+        self._push_value(item)
+        self._push_description(description)
 
     def pop(self, return_description: bool = False) -> Union[Value, Operation]:
-        entry = self._s.pop()
+        value = self._pop_value()
+        description = self._pop_description()
         if return_description:
-            return entry.value, entry.description
-        return entry.value
-
-    def from_top(self, offset: int = 0, return_description: bool = False) -> Union[Value, Operation]:
-        entry = self._s[-offset-1]
-        if return_description:
-            return entry.value, entry.description
-        return entry.value
+            return StackEntry(value, description)
+        return value
+
+    def pop_many(self, count: int) -> List[Union[Value, Operation]]:
+        """ Pops the top `count` items, topmost first. """
+        if count <= 0:
+            return []
+        values = self._values[-count:]
+        del self._values[-count:]
+        del self._descriptions[-count:]
+        values.reverse()
+        return values
+
+    def top(self) -> Union[Value, Operation]:
+        return self._values[-1]
 
     @property
     def length(self) -> int:
-        return len(self._s)
+        return len(self._values)
@@ -1,8 +1,8 @@
 from dataclasses import dataclass, field
 import re
+from sys import intern
 from enum import Enum
-from typing import Iterable, List, Tuple, Union
-from anytree import Node as AnyNode
+from typing import Dict, Iterable, List, NoReturn, Optional, Sequence, Tuple, Union
 
 from .error_logger import ParserErrorLogger
 from ..codegen.codegen import ActionSymbol, CodeGenerator, Symbols
@@ -33,7 +33,7 @@ class UnexpectedEOF(Exception):
         self.tree = tree
 
 
-@dataclass
+@dataclass(slots=True)
 class Node:
     name: Union[str, Token]
     children: List['Node'] = field(default_factory=list)
@@ -41,20 +41,48 @@ class Node:
     def __str__(self) -> str:
         return str(self.name)
 
-    def to_anytree(self, parent: AnyNode = None) -> AnyNode:
-        anynode = AnyNode(str(self), parent=parent)
-        for child in self.children:
-            child.to_anytree(parent=anynode)
-        return anynode
+    def render(self) -> List[str]:
+        """ Returns the preorder lines of the tree, drawn like anytree's RenderTree. """
+        lines = [str(self)]
+        stack = [(child, '', i == 0) for i, child in enumerate(reversed(self.children))]
+        while stack:
+            node, indent, last = stack.pop()
+            lines.append(f'{indent}{"└── " if last else "├── "}{node}')
+            indent += '    ' if last else '│   '
+            stack.extend((child, indent, i == 0) for i, child in enumerate(reversed(node.children)))
+        return lines
+
+
+_LITERAL = re.compile(r'(?:[^.^$*+?{}()\[\]|\\]|\\[^A-Za-z0-9])+|[{}]')
+
+
+def _literal_alternatives(pattern: str) -> Optional[Tuple[str, ...]]:
+    """ Expands a pattern like r'(int|void)' into its literals, or None if it is not that simple. """
+    body = pattern[1:-1] if pattern[:1] == '(' and pattern[-1:] == ')' else pattern
+    alternatives = body.split('|')
+    if not all(_LITERAL.fullmatch(alternative) for alternative in alternatives):
+        return None
+    return tuple(re.sub(r'\\(.)', r'\1', alternative) for alternative in alternatives)
 
 
 class Matchable:
     def __init__(self, token_type: TokenType, pattern: str = r'.+'):
         self.token_type = token_type
         self.pattern = pattern
+        self._match = re.compile(pattern).match
+        self._any = pattern == r'.+'
+        self._literals = _literal_alternatives(pattern)
 
     def matches(self, token: Token) -> bool:
-        return self.token_type == token.type and re.match(self.pattern, token.lexeme)
+        if self.token_type is not token.type:
+            return False
+        if self._any:
+            # same as re.match(r'.+', lexeme): non-empty, not starting with a newline
+            return token.lexeme[:1] not in ('', '\n')
+        if self._literals is not None:
+            # same as re.match: a literal alternative is a prefix of the lexeme
+            return token.lexeme.startswith(self._literals)
+        return self._match(token.lexeme) is not None
 
 
 class EpsilonMatchable:
@@ -66,62 +94,99 @@ class ParserState(State[Token]):
     def __init__(self, id: int, final: bool = False):
         super().__init__(id)
         self.final = final
+        self.terminals: Dict[Tuple[TokenType, Optional[str]], 'TerminalTransition'] = {}
+        self.nonterminals: List['NonTerminalTransition'] = []
+        self.epsilon: Optional['EpsilonTransition'] = None
+
+    def add_transition(self, transition: Transition[Token]) -> None:
+        super().add_transition(transition)
+        self._build_tables()
+
+    def _build_tables(self) -> None:
+        """ Rebuilds the dispatch tables from the transitions list.
+
+        Terminal transitions are keyed by (token type, value); a transition
+        without a value is keyed by (token type, None) and shadows the later
+        transitions of the same token type, as the linear scan would.
+        """
+        self.terminals = {}
+        wildcards = set()
+        for transition in self.transitions:
+            if isinstance(transition, TerminalTransition):
+                if transition.token_type in wildcards:
+                    continue
+                if transition.value is None:
+                    wildcards.add(transition.token_type)
+                self.terminals.setdefault((transition.token_type, transition.value), transition)
+        self.nonterminals = [t for t in self.transitions if isinstance(t, NonTerminalTransition)]
+        self.epsilon = next((t for t in self.transitions if isinstance(t, EpsilonTransition)), None)
 
 
 class ParserTransition(Transition[Token]):
-    def __init__(self, target: State, symbols: List[ActionSymbol] = []) -> None:
+    def __init__(self, target: State, symbols: Sequence[ActionSymbol] = ()) -> None:
         super().__init__(target)
-        self.symbols = symbols
+        self.symbols = tuple(symbols)
+        self._routines = tuple(Symbols.routine_for(symbol) for symbol in symbols)
 
     def action(self, token: Token) -> None:
-        for symbol in self.symbols:
-            Symbols.symbols[symbol](CodeGenerator.instance, token)
+        codegen = CodeGenerator.instance
+        for routine, takes_token in self._routines:
+            if takes_token:
+                routine(codegen, token)
+            else:
+                routine(codegen)
 
 class TerminalTransition(ParserTransition):
-    def __init__(self, target: State, token_type: TokenType, value: str = None, symbols: List[ActionSymbol] = []) -> None:
+    def __init__(self, target: State, token_type: TokenType, value: str = None, symbols: Sequence[ActionSymbol] = ()) -> None:
         super().__init__(target, symbols=symbols)
-        self.value = value
+        self.value = intern(value) if value is not None else None
         self.token_type = token_type
 
     def matches(self, token: Token) -> Tuple[Node, Token]:
         if token.type == self.token_type and (self.value == token.lexeme or self.value is None):
-            return Node(token), Scanner.instance.get_next_token()
+            return self.consume(token)
         return None
 
+    def consume(self, token: Token) -> Tuple[Node, Token]:
+        """ Accepts a token already known to match this transition. """
+        return Node(token), Scanner.instance.get_next_token()
+
 
 class NonTerminalTransition(ParserTransition):
-    def __init__(self, target: State, dfa: 'ParserDFA', name: str, symbols: List[ActionSymbol] = []) -> None:
+    def __init__(self, target: State, dfa: 'ParserDFA', name: str, symbols: Sequence[ActionSymbol] = ()) -> None:
         super().__init__(target, symbols=symbols)
         self.name = format_nonterminal_name(name)
         self.dfa = dfa
 
     def matches(self, token: Token) -> Tuple[Node, Token]:
-        self.dfa.reset()
+        dfa = self.dfa
+        dfa.reset()
         tree = Node(self.name)
+        transition, add_child = dfa.transition, tree.children.append
         while True:
             try:
-                next_state, subtree, next_token = self.dfa.transition(token)
-                tree.children.append(subtree)
+                next_state, subtree, next_token = transition(token)
+                add_child(subtree)
             except UnexpectedEOF as e:
-                tree.children.append(e.tree)
+                add_child(e.tree)
                 e.tree = tree
                 raise e
             except ParserError as e:
                 if e.type == ParserErrorType.MissingTerminal:
-                    next_state = self.dfa.current_state.transitions[0].target
+                    next_state = dfa.current_state.transitions[0].target
                     next_token = token
                 elif e.type == ParserErrorType.MissingNonTerminal:
-                    nonterm_transition = next((t for t in self.dfa.current_state.transitions if isinstance(t, NonTerminalTransition)))
+                    nonterm_transition = dfa.current_state.nonterminals[0]
                     next_state = nonterm_transition.target
                     next_token = token
                 else:
-                    nonterm_transition = next((t for t in self.dfa.current_state.transitions if isinstance(t, NonTerminalTransition)))
+                    nonterm_transition = dfa.current_state.nonterminals[0]
                     while True:
                         token = Scanner.instance.get_next_token()
                         if nonterm_transition.dfa.in_first(token) or nonterm_transition.dfa.in_follow(token):
                             subtree, next_token = nonterm_transition.matches(token)
                             next_state = nonterm_transition.target
-                            tree.children.append(subtree)
+                            add_child(subtree)
                             break
                         if token.type == TokenType.EOF:
                             ParserErrorLogger.instance.unexpected_eof(token.lineno)
@@ -131,12 +196,12 @@ class NonTerminalTransition(ParserTransition):
             if next_state.final:
                 return tree, next_token
 
-            self.dfa.current_state = next_state
+            dfa.current_state = next_state
             token = next_token
 
 class EpsilonTransition(ParserTransition):
     
-    def __init__(self, target: State, parent_dfa: 'ParserDFA', symbols: List[ActionSymbol] = []) -> None:
+    def __init__(self, target: State, parent_dfa: 'ParserDFA', symbols: Sequence[ActionSymbol] = ()) -> None:
         super().__init__(target, symbols=symbols)
         self.parent_dfa = parent_dfa
 
@@ -152,49 +217,73 @@ class ParserDFA(DFA[Token]):
         self.follow = follow
         self.name = format_nonterminal_name(name)
         self.current_state = start_state
+        self._first_has_epsilon = any(isinstance(m, EpsilonMatchable) for m in first)
+        self._first_terminals = tuple(m for m in first if not isinstance(m, EpsilonMatchable))
+        self._follow_terminals = tuple(m for m in follow if not isinstance(m, EpsilonMatchable))
+        self._first_cache: Dict[Tuple[TokenType, str], bool] = {}
+        self._follow_cache: Dict[Tuple[TokenType, str], bool] = {}
 
     def reset(self) -> None:
         self.current_state = self.start_state
 
     def transition(self, token: Token) -> Tuple['State', Node, Token]:
-        for transition in self.current_state.transitions:
-            if isinstance(transition, TerminalTransition) and (r := transition.matches(token)) is not None:
-                if token.type == TokenType.ID:
-                    SymbolTable.instance().add_symbol(token.lexeme)
-                transition.action(token)
-                return transition.target, *r
-            if isinstance(transition, NonTerminalTransition) and transition.dfa.in_first(token):
+        state = self.current_state
+        terminals = state.terminals
+        transition = terminals.get((token.type, token.lexeme)) or terminals.get((token.type, None))
+        if transition is not None:
+            r = transition.consume(token)
+            if token.type == TokenType.ID:
+                SymbolTable.instance().add_symbol(token.lexeme)
+            transition.action(token)
+            return transition.target, *r
+        for transition in state.nonterminals:
+            if transition.dfa.in_first(token):
                 transition.action(token)
                 m, token = transition.matches(token)
                 return transition.target, m, token
-        epsilon_transition = next((t for t in self.current_state.transitions if isinstance(t, EpsilonTransition)), None)
-        if epsilon_transition is None or not epsilon_transition.parent_dfa.in_follow(token): # syntax error
-            if all(isinstance(transition, (TerminalTransition, EpsilonTransition)) for transition in self.current_state.transitions):
-                error_lexeme = self.current_state.transitions[0].value \
-                    or self.current_state.transitions[0].token_type.value
-                ParserErrorLogger.instance.missing_token(token.lineno, error_lexeme)
-                raise ParserError(ParserErrorType.MissingTerminal)
-
-            nonterm_transition = next((t for t in self.current_state.transitions if isinstance(t, NonTerminalTransition)))
-            if nonterm_transition.dfa.in_follow(token):
-                ParserErrorLogger.instance.missing_token(token.lineno, nonterm_transition.name)
-                raise ParserError(ParserErrorType.MissingNonTerminal)
-
-            ParserErrorLogger.instance.illegal_token(token)
-            raise ParserError(ParserErrorType.IllegalToken)
+        epsilon_transition = state.epsilon
+        if epsilon_transition is None or not epsilon_transition.parent_dfa.in_follow(token):
+            self._raise_syntax_error(state, token)
 
         epsilon_transition.action(token)
         return epsilon_transition.target, Node('epsilon'), token
 
     def in_first(self, token: Token) -> bool:
-        m = self._in_set(self.first, token)
-        if not m and any(isinstance(other_m, EpsilonMatchable) for other_m in self.first):
-            return self.in_follow(token)
-        return m
+        key = (token.type, token.lexeme)
+        try:
+            return self._first_cache[key]
+        except KeyError:
+            m = self._in_set(self._first_terminals, token)
+            if not m and self._first_has_epsilon:
+                m = self.in_follow(token)
+            self._first_cache[key] = m
+            return m
 
     def in_follow(self, token: Token) -> bool:
-        return self._in_set(self.follow, token)
+        key = (token.type, token.lexeme)
+        try:
+            return self._follow_cache[key]
+        except KeyError:
+            m = self._follow_cache[key] = self._in_set(self._follow_terminals, token)
+            return m
+
+    @staticmethod
+    def _raise_syntax_error(state: ParserState, token: Token) -> NoReturn:
+        """ Logs and raises the syntax error for a token no transition accepts (cold path). """
+        if not state.nonterminals:
+            error_lexeme = state.transitions[0].value \
+                or state.transitions[0].token_type.value
+            ParserErrorLogger.instance.missing_token(token.lineno, error_lexeme)
+            raise ParserError(ParserErrorType.MissingTerminal)
+
+        nonterm_transition = state.nonterminals[0]
+        if nonterm_transition.dfa.in_follow(token):
+            ParserErrorLogger.instance.missing_token(token.lineno, nonterm_transition.name)
+            raise ParserError(ParserErrorType.MissingNonTerminal)
+
+        ParserErrorLogger.instance.illegal_token(token)
+        raise ParserError(ParserErrorType.IllegalToken)
 
     @staticmethod
     def _in_set(the_set: Iterable[Matchable], token: Token) -> bool:
-        return next((True for m in the_set if not isinstance(m, EpsilonMatchable) and m.matches(token)), False)
+        return any(m.matches(token) for m in the_set)
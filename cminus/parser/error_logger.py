@@ -1,10 +1,14 @@
 from enum import Enum
+from typing import List
 
 from cminus.scanner.dfa import TokenType
 
 from ..scanner.scanner import Token
 
 
+_LEXEME_TOKEN_TYPES = frozenset((TokenType.ID, TokenType.NUM))
+
+
 class _ErrorType(Enum):
     IllegalToken = 'illegal'
     MissingToken = 'missing'
@@ -19,6 +23,7 @@ class ParserErrorLogger:
         self.file_name = file_name
         self.log_file = open(file_name, 'w')
         self.any_error = False
+        self._lines: List[str] = []
 
     def __enter__(self):
         return self
@@ -26,12 +31,14 @@ class ParserErrorLogger:
     def __exit__(self, exc_type, exc_val, exc_tb):
         if not self.any_error:
             self.log_file.write('There is no syntax error.\n')
+        else:
+            self.log_file.write(''.join(self._lines))
         self.log_file.close()
 
     def __log(self, lineno: int, errortype: _ErrorType, token: str = None) -> None:
         formatted = f'#{lineno} : syntax error, {errortype.value}'
         formatted += f' {token}\n' if token else '\n'
-        self.log_file.write(formatted)
+        self._lines.append(formatted)
         self.any_error = True
 
     def missing_token(self, lineno: int, lexeme: str):
@@ -39,7 +46,7 @@ class ParserErrorLogger:
 
     def illegal_token(self, token: Token):
         lexeme = token.lexeme \
-            if token.type not in [TokenType.ID, TokenType.NUM] \
+            if token.type not in _LEXEME_TOKEN_TYPES \
             else token.type.value
         self.__log(token.lineno, _ErrorType.IllegalToken, lexeme)
 
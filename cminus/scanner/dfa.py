@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Generic, List, Tuple, TypeVar, Union
+from typing import Any, Callable, Dict, Generic, List, Tuple, TypeVar, Union
 from enum import Enum
 import re
 
@@ -21,6 +21,9 @@ TTransitionToken = TypeVar('TTransitionToken')
 
 
 class State(Generic[TTransitionToken]):
+    is_final = False
+    is_error = False
+
     def __init__(self, id: int):
         self.id = id
         self.transitions: List['Transition[TTransitionToken]'] = []
@@ -29,18 +32,38 @@ class State(Generic[TTransitionToken]):
         self.transitions.append(transition)
 
     def transition(self, token: TTransitionToken) -> 'State':
-        for t in self.transitions:
-            if t.matches(token):
-                return t.target
+        return next((t.target for t in self.transitions if t.matches(token)), None)
+
+
+class ScannerState(State[str]):
+    """ A scanner DFA state, whose transition targets are memoized per character. """
+
+    def __init__(self, id: int):
+        super().__init__(id)
+        self._targets: Dict[str, State] = {}
+
+    def add_transition(self, transition: 'Transition[str]'):
+        super().add_transition(transition)
+        self._targets.clear()
+
+    def transition(self, token: str) -> State:
+        try:
+            return self._targets[token]
+        except KeyError:
+            target = self._targets[token] = super().transition(token)
+            return target
+
 
+class FinalState(ScannerState):
+    is_final = True
 
-class FinalState(State[str]):
     def __init__(self, id: int, token_type_resolver: Callable[[str], TokenType]):
         super().__init__(id)
         self.resolve_token_type = token_type_resolver
 
 
-class ErrorState(State[str]):
+class ErrorState(ScannerState):
+    is_error = True
 
     def __init__(self, id: int, message):
         super().__init__(id)
@@ -67,9 +90,10 @@ class RegexTransition(Transition[str]):
     def __init__(self, target: State, pattern: str):
         super().__init__(target)
         self.pattern = pattern
+        self._match = re.compile(pattern).match
 
     def matches(self, char: str) -> bool:
-        return re.match(self.pattern, char) is not None
+        return self._match(char) is not None
 
 
 class DFA(Generic[TTransitionToken]):
@@ -1,11 +1,15 @@
+from sys import intern
 from typing import List, Tuple
 from dataclasses import dataclass
 
-from .dfa import DFA, ErrorState, FinalState, State, TokenType
+from .dfa import DFA, State, TokenType
 from .error import ScannerError
 
 
-@dataclass
+SKIPPED_TOKEN_TYPES = frozenset((TokenType.WHITESPACE, TokenType.COMMENT))
+
+
+@dataclass(slots=True)
 class Token:
     type: TokenType
     lexeme: str
@@ -37,36 +41,36 @@ class Scanner:
         Returns:
             Token: Line number, the next token type and its lexeme.
         """
-        if not self.has_next_token():
-            return Token(TokenType.EOF, '$', self._lineno)
+        while self.has_next_token():
+            try:
+                next_token_type, next_token_lexeme = self._next_token_lookahead()
+            except ScannerError as e:
+                self._token_start += len(e.lexeme)
+                raise
 
-        try:
-            next_token_type, next_token_lexeme = self._next_token_lookahead()
-        except ScannerError as e:
-            self._token_start += len(e.lexeme)
-            raise
+            self._token_start += len(next_token_lexeme)
 
-        self._token_start += len(next_token_lexeme)
+            if next_token_type in SKIPPED_TOKEN_TYPES:
+                # only whitespace and comments can span lines
+                self._lineno += next_token_lexeme.count('\n')
+                continue
+            return Token(next_token_type, intern(next_token_lexeme), self._lineno)
 
-        try:
-            return Token(next_token_type, next_token_lexeme, self._lineno)
-        finally:
-            self._lineno += next_token_lexeme.count('\n')
-            if next_token_type in [TokenType.WHITESPACE, TokenType.COMMENT]:
-                return self.get_next_token()
+        return Token(TokenType.EOF, '$', self._lineno)
 
     def _next_token_lookahead(self) -> Tuple[TokenType, str]:
+        code = self._code
         current_state = self._dfa.start_state
-        for i in range(self._token_start, len(self._code)):
+        for i in range(self._token_start, len(code)):
 
-            next_state = current_state.transition(self._code[i])
+            next_state = current_state.transition(code[i])
 
-            if isinstance(current_state, ErrorState):
-                if not isinstance(next_state, ErrorState):
+            if current_state.is_error:
+                if next_state is None or not next_state.is_error:
                     self._error(current_state.message, end=i)
 
-            if isinstance(current_state, FinalState):
-                if not isinstance(next_state, (FinalState, ErrorState)):
+            if current_state.is_final:
+                if next_state is None or not (next_state.is_final or next_state.is_error):
                     return self._get_token(current_state, i)
 
             if next_state is None:
@@ -75,10 +79,10 @@ class Scanner:
             current_state = next_state
 
         try:
-            if isinstance(current_state, ErrorState):
+            if current_state.is_error:
                 self._error(current_state.message)
             
-            if isinstance(current_state, FinalState):
+            if current_state.is_final:
                 return self._get_token(current_state)
 
             if current_state.id in self._unclosed_comment_states:
@@ -1,9 +1,9 @@
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List
+from typing import Dict, List
 
 
-KEYWORDS = [
+KEYWORDS = frozenset((
     'if',
     'else',
     'endif',
@@ -13,7 +13,7 @@ KEYWORDS = [
     'break',
     'until',
     'return'
-]
+))
 
 
 class IdType(Enum):
@@ -24,7 +24,7 @@ class IdType(Enum):
     NotSpecified = 'not_specified'
 
 
-@dataclass
+@dataclass(slots=True)
 class Id:
     lexeme: str
     address: int = None
@@ -37,28 +37,33 @@ class Scope:
     def __init__(self, parent: 'Scope' = None) -> None:
         self.parent = parent
         self._locals: List[Id] = []
+        self._by_lexeme: Dict[str, Id] = {}
 
     def append(self, lexeme: str, address: int = None) -> Id:
         id_ = Id(lexeme, address)
         self._locals.append(id_)
+        self._by_lexeme.setdefault(lexeme, id_)
         return id_
 
-    def lookup(self, lexeme: str) -> Id:
-        return next((id_ for id_ in self._locals
-                     if id_.lexeme == lexeme),
-                    self.parent.lookup(lexeme) if self.parent else None)
+    def get_local(self, lexeme: str) -> Id:
+        """ Returns the first id declared with the lexeme in this scope only. """
+        return self._by_lexeme.get(lexeme)
 
     def lookup_by_instno(self, instno: int) -> Id:
-        return next((id_ for id_ in self._locals
-                     if id_.address == instno
-                     and id_.type == IdType.Function),
-                    self.parent.lookup_by_instno(instno) if self.parent else None)
+        id_ = next((id_ for id_ in self._locals
+                    if id_.address == instno
+                    and id_.type is IdType.Function), None)
+        if id_ is None and self.parent:
+            return self.parent.lookup_by_instno(instno)
+        return id_
 
     def lookup_by_address(self, address: int) -> Id:
-        return next((id_ for id_ in self._locals
-                     if id_.address == address
-                     and id_.type != IdType.Function),
-                    self.parent.lookup_by_address(address) if self.parent else None)
+        id_ = next((id_ for id_ in self._locals
+                    if id_.address == address
+                    and id_.type is not IdType.Function), None)
+        if id_ is None and self.parent:
+            return self.parent.lookup_by_address(address)
+        return id_
 
 
 class SymbolTable:
@@ -70,15 +75,22 @@ class SymbolTable:
             cls._instance = SymbolTable()
         return cls._instance
 
+    @classmethod
+    def reset(cls) -> 'SymbolTable':
+        cls._instance = SymbolTable()
+        return cls._instance
+
     def __init__(self) -> None:
         self.declaring = False
         self._scopes = [Scope()]
+        self._lookups: Dict[str, Id] = {}
 
     def create_scope(self) -> None:
         self._scopes.append(Scope(self._current_scope))
 
     def delete_scope(self) -> None:
         self._scopes.pop()
+        self._lookups.clear()
 
     @property
     def _current_scope(self) -> Scope:
@@ -87,10 +99,20 @@ class SymbolTable:
     def add_symbol(self, lexeme: str, address: int = None, force: bool = False) -> Id:
         if self.declaring or force:
             self.declaring = False
+            self._lookups.pop(lexeme, None)
             return self._current_scope.append(lexeme, address)
 
     def lookup(self, lexeme: str) -> Id:
-        return self._current_scope.lookup(lexeme)
+        try:
+            return self._lookups[lexeme]
+        except KeyError:
+            id_ = None
+            for scope in reversed(self._scopes):
+                id_ = scope.get_local(lexeme)
+                if id_ is not None:
+                    break
+            self._lookups[lexeme] = id_
+            return id_
 
     def lookup_by_instno(self, instno: int) -> Id:
         return self._current_scope.lookup_by_instno(instno)
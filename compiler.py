@@ -1,43 +1,43 @@
 from dataclasses import dataclass, field
+from functools import lru_cache
 import os
-from typing import Callable, Dict, Iterable, List
+from typing import Callable, Dict, Iterable, List, Sequence
 
-from anytree import RenderTree
 from cminus.codegen.codegen import ActionSymbol, CodeGenerator
 from cminus.codegen.config import CodeGenConfig
 from cminus.codegen.error_logger import CodeGenErrorLogger
 from cminus.parser.error_logger import ParserErrorLogger
-from cminus.scanner.dfa import DFA, ErrorState, State, FinalState, RegexTransition, TokenType
+from cminus.scanner.dfa import DFA, ErrorState, ScannerState, FinalState, RegexTransition, TokenType
 from cminus.scanner.scanner import Scanner
 from cminus.parser.dfa import EpsilonMatchable, EpsilonTransition, Matchable, NonTerminalTransition, ParserDFA, ParserState, TerminalTransition, UnexpectedEOF
-from cminus.scanner.symbol_table import KEYWORDS
+from cminus.scanner.symbol_table import KEYWORDS, SymbolTable
 
 
-@dataclass
+@dataclass(slots=True)
 class TransitionInfo:
     source: int
     target: int
 
 
-@dataclass
+@dataclass(slots=True)
 class TerminalTransitionInfo(TransitionInfo):
     token_type: TokenType
     value: str = None
-    symbols: List[ActionSymbol] = field(default_factory=list)
+    symbols: Sequence[ActionSymbol] = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class NonTerminalTransitionInfo(TransitionInfo):
     name: str
-    symbols: List[ActionSymbol] = field(default_factory=list)
+    symbols: Sequence[ActionSymbol] = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class EpsilonTransitionInfo(TransitionInfo):
-    symbols: List[ActionSymbol] = field(default_factory=list)
+    symbols: Sequence[ActionSymbol] = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class ParserDFAInfo:
     num_states: int
     final_state: int
@@ -48,8 +48,34 @@ class ParserDFAInfo:
     epsilon_transitions: List[EpsilonTransitionInfo] = field(default_factory=list)
 
 
-def create_transition_diagrams() -> ParserDFA:
-    infos: Dict[str, ParserDFAInfo] = dict(
+@lru_cache(maxsize=None)
+def create_dfa_infos() -> Dict[str, ParserDFAInfo]:
+    declaration_follow = (
+        Matchable(TokenType.EOF),
+        Matchable(TokenType.SYMBOL, r'(;|\(|{|})'),
+        Matchable(TokenType.KEYWORD, r'(break|if|repeat|return|int|void)'),
+        Matchable(TokenType.ID),
+        Matchable(TokenType.NUM),
+    )
+    statement_follow = (
+        Matchable(TokenType.SYMBOL, r'({|}|\(|;)'),
+        Matchable(TokenType.KEYWORD, r'(break|if|repeat|return|endif|else|until)'),
+        Matchable(TokenType.ID),
+        Matchable(TokenType.NUM),
+    )
+    expression_follow = (
+        Matchable(TokenType.SYMBOL, r'(;|\)|\]|,)'),
+    )
+    additive_expression_follow = (
+        Matchable(TokenType.SYMBOL, r'(<|==|;|\)|\]|,)'),
+    )
+    term_follow = (
+        Matchable(TokenType.SYMBOL, r'(\+|-|;|\)|<|==|\]|,)'),
+    )
+    factor_follow = (
+        Matchable(TokenType.SYMBOL, r'(\+|-|;|\)|<|==|\]|,|\*)'),
+    )
+    return dict(
         program=ParserDFAInfo(
             num_states=3,
             final_state=3,
@@ -98,13 +124,7 @@ def create_transition_diagrams() -> ParserDFA:
             first=[
                 Matchable(TokenType.KEYWORD, r'(int|void)'),
             ],
-            follow=[
-                Matchable(TokenType.EOF),
-                Matchable(TokenType.SYMBOL, r'(;|\(|{|})'),
-                Matchable(TokenType.KEYWORD, r'(break|if|repeat|return|int|void)'),
-                Matchable(TokenType.ID),
-                Matchable(TokenType.NUM),
-            ],
+            follow=declaration_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(1, 2, 'declaration_initial',
                                           symbols=[ActionSymbol.Declare]),
@@ -139,13 +159,7 @@ def create_transition_diagrams() -> ParserDFA:
             first=[
                 Matchable(TokenType.SYMBOL, r'(\(|\[|;)'),
             ],
-            follow=[
-                Matchable(TokenType.EOF),
-                Matchable(TokenType.SYMBOL, r'(;|\(|{|})'),
-                Matchable(TokenType.KEYWORD, r'(break|if|repeat|return|int|void)'),
-                Matchable(TokenType.ID),
-                Matchable(TokenType.NUM),
-            ],
+            follow=declaration_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(1, 2, 'fun_declaration_prime'),
                 NonTerminalTransitionInfo(1, 2, 'var_declaration_prime',
@@ -158,13 +172,7 @@ def create_transition_diagrams() -> ParserDFA:
             first=[
                 Matchable(TokenType.SYMBOL, r'(;|\[)'),
             ],
-            follow=[
-                Matchable(TokenType.EOF),
-                Matchable(TokenType.SYMBOL, r'(;|\(|{|})'),
-                Matchable(TokenType.KEYWORD, r'(break|if|repeat|return|int|void)'),
-                Matchable(TokenType.ID),
-                Matchable(TokenType.NUM),
-            ],
+            follow=declaration_follow,
             terminal_transitions=[
                 TerminalTransitionInfo(1, 2, TokenType.SYMBOL, '['),
                 TerminalTransitionInfo(2, 3, TokenType.NUM,
@@ -181,13 +189,7 @@ def create_transition_diagrams() -> ParserDFA:
             first=[
                 Matchable(TokenType.SYMBOL, r'\('),
             ],
-            follow=[
-                Matchable(TokenType.EOF),
-                Matchable(TokenType.SYMBOL, r'(;|\(|{|})'),
-                Matchable(TokenType.KEYWORD, r'(break|if|repeat|return|int|void)'),
-                Matchable(TokenType.ID),
-                Matchable(TokenType.NUM),
-            ],
+            follow=declaration_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(2, 3, 'params'),
                 NonTerminalTransitionInfo(4, 5, 'compound_stmt'),
@@ -361,12 +363,7 @@ def create_transition_diagrams() -> ParserDFA:
                 Matchable(TokenType.ID),
                 Matchable(TokenType.NUM),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'({|}|\(|;)'),
-                Matchable(TokenType.KEYWORD, r'(break|if|repeat|return|endif|else|until)'),
-                Matchable(TokenType.ID),
-                Matchable(TokenType.NUM),
-            ],
+            follow=statement_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(1, 2, 'expression_stmt'),
                 NonTerminalTransitionInfo(1, 2, 'compound_stmt'),
@@ -384,12 +381,7 @@ def create_transition_diagrams() -> ParserDFA:
                 Matchable(TokenType.ID),
                 Matchable(TokenType.NUM),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'({|}|\(|;)'),
-                Matchable(TokenType.KEYWORD, r'(break|if|repeat|return|endif|else|until)'),
-                Matchable(TokenType.ID),
-                Matchable(TokenType.NUM),
-            ],
+            follow=statement_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(1, 2, 'expression'),
             ],
@@ -410,12 +402,7 @@ def create_transition_diagrams() -> ParserDFA:
             first=[
                 Matchable(TokenType.KEYWORD, r'if'),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'({|}|\(|;)'),
-                Matchable(TokenType.KEYWORD, r'(break|if|repeat|return|endif|else|until)'),
-                Matchable(TokenType.ID),
-                Matchable(TokenType.NUM),
-            ],
+            follow=statement_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(3, 4, 'expression'),
                 NonTerminalTransitionInfo(5, 6, 'statement',
@@ -438,12 +425,7 @@ def create_transition_diagrams() -> ParserDFA:
             first=[
                 Matchable(TokenType.KEYWORD, r'(else|endif)'),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'({|}|\(|;)'),
-                Matchable(TokenType.KEYWORD, r'(break|if|repeat|return|endif|else|until)'),
-                Matchable(TokenType.ID),
-                Matchable(TokenType.NUM),
-            ],
+            follow=statement_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(2, 3, 'statement',
                                           symbols=[ActionSymbol.SimpleScope,
@@ -469,12 +451,7 @@ def create_transition_diagrams() -> ParserDFA:
             first=[
                 Matchable(TokenType.KEYWORD, r'repeat'),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'({|}|\(|;)'),
-                Matchable(TokenType.KEYWORD, r'(break|if|repeat|return|endif|else|until)'),
-                Matchable(TokenType.ID),
-                Matchable(TokenType.NUM),
-            ],
+            follow=statement_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(2, 3, 'statement',
                                           symbols=[ActionSymbol.Label,
@@ -498,12 +475,7 @@ def create_transition_diagrams() -> ParserDFA:
             first=[
                 Matchable(TokenType.KEYWORD, r'return'),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'({|}|\(|;)'),
-                Matchable(TokenType.KEYWORD, r'(break|if|repeat|return|endif|else|until)'),
-                Matchable(TokenType.ID),
-                Matchable(TokenType.NUM),
-            ],
+            follow=statement_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(2, 3, 'return_stmt_prime'),
             ],
@@ -523,12 +495,7 @@ def create_transition_diagrams() -> ParserDFA:
                 Matchable(TokenType.ID),
                 Matchable(TokenType.NUM),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'({|}|\(|;)'),
-                Matchable(TokenType.KEYWORD, r'(break|if|repeat|return|endif|else|until)'),
-                Matchable(TokenType.ID),
-                Matchable(TokenType.NUM),
-            ],
+            follow=statement_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(1, 2, 'expression',
                                           symbols=[ActionSymbol.Prv]),
@@ -548,9 +515,7 @@ def create_transition_diagrams() -> ParserDFA:
                 Matchable(TokenType.ID),
                 Matchable(TokenType.NUM),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(;|\)|\]|,)'),
-            ],
+            follow=expression_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(2, 3, 'B'),
                 NonTerminalTransitionInfo(1, 3, 'simple_expression_zegond'),
@@ -567,9 +532,7 @@ def create_transition_diagrams() -> ParserDFA:
                 EpsilonMatchable(),
                 Matchable(TokenType.SYMBOL, r'(\[|=|\(|\*|\+|-|<|==)'),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(;|\)|\]|,)'),
-            ],
+            follow=expression_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(2, 3, 'expression'),
                 NonTerminalTransitionInfo(4, 5, 'H',
@@ -593,9 +556,7 @@ def create_transition_diagrams() -> ParserDFA:
                 EpsilonMatchable(),
                 Matchable(TokenType.SYMBOL, r'(=|\*|\+|-|<|==)'),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(;|\)|\]|,)'),
-            ],
+            follow=expression_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(1, 2, 'G'),
                 NonTerminalTransitionInfo(2, 3, 'D'),
@@ -616,9 +577,7 @@ def create_transition_diagrams() -> ParserDFA:
                 Matchable(TokenType.SYMBOL, r'\('),
                 Matchable(TokenType.NUM),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(;|\)|\]|,)'),
-            ],
+            follow=expression_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(1, 2, 'additive_expression_zegond'),
                 NonTerminalTransitionInfo(2, 3, 'C'),
@@ -631,9 +590,7 @@ def create_transition_diagrams() -> ParserDFA:
                 EpsilonMatchable(),
                 Matchable(TokenType.SYMBOL, r'(\(|\*|\+|-|<|==)'),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(;|\)|\]|,)'),
-            ],
+            follow=expression_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(1, 2, 'additive_expression_prime'),
                 NonTerminalTransitionInfo(2, 3, 'C'),
@@ -646,9 +603,7 @@ def create_transition_diagrams() -> ParserDFA:
                 EpsilonMatchable(),
                 Matchable(TokenType.SYMBOL, r'(<|==)'),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(;|\)|\]|,)'),
-            ],
+            follow=expression_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(1, 2, 'relop'),
                 NonTerminalTransitionInfo(2, 3, 'additive_expression'),
@@ -684,9 +639,7 @@ def create_transition_diagrams() -> ParserDFA:
                 Matchable(TokenType.ID),
                 Matchable(TokenType.NUM),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(;|\)|\]|,)'),
-            ],
+            follow=expression_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(1, 2, 'term'),
                 NonTerminalTransitionInfo(2, 3, 'D'),
@@ -699,9 +652,7 @@ def create_transition_diagrams() -> ParserDFA:
                 EpsilonMatchable(),
                 Matchable(TokenType.SYMBOL, r'(\(|\*|\+|-)'),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(<|==|;|\)|\]|,)'),
-            ],
+            follow=additive_expression_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(1, 2, 'term_prime'),
                 NonTerminalTransitionInfo(2, 3, 'D'),
@@ -714,9 +665,7 @@ def create_transition_diagrams() -> ParserDFA:
                 Matchable(TokenType.SYMBOL, r'\('),
                 Matchable(TokenType.NUM),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(<|==|;|\)|\]|,)'),
-            ],
+            follow=additive_expression_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(1, 2, 'term_zegond'),
                 NonTerminalTransitionInfo(2, 3, 'D'),
@@ -729,9 +678,7 @@ def create_transition_diagrams() -> ParserDFA:
                 EpsilonMatchable(),
                 Matchable(TokenType.SYMBOL, r'(\+|-)'),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(<|==|;|\)|\]|,)'),
-            ],
+            follow=additive_expression_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(1, 2, 'addop'),
                 NonTerminalTransitionInfo(2, 3, 'term'),
@@ -767,9 +714,7 @@ def create_transition_diagrams() -> ParserDFA:
                 Matchable(TokenType.ID),
                 Matchable(TokenType.NUM),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(\+|-|;|\)|<|==|\]|,)'),
-            ],
+            follow=term_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(1, 2, 'factor'),
                 NonTerminalTransitionInfo(2, 3, 'G'),
@@ -782,9 +727,7 @@ def create_transition_diagrams() -> ParserDFA:
                 EpsilonMatchable(),
                 Matchable(TokenType.SYMBOL, r'(\*|\()'),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(\+|-|;|\)|<|==|\]|,)'),
-            ],
+            follow=term_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(1, 2, 'factor_prime'),
                 NonTerminalTransitionInfo(2, 3, 'G'),
@@ -797,9 +740,7 @@ def create_transition_diagrams() -> ParserDFA:
                 Matchable(TokenType.SYMBOL, r'\('),
                 Matchable(TokenType.NUM),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(\+|-|;|\)|<|==|\]|,)'),
-            ],
+            follow=term_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(1, 2, 'factor_zegond'),
                 NonTerminalTransitionInfo(2, 3, 'G'),
@@ -812,9 +753,7 @@ def create_transition_diagrams() -> ParserDFA:
                 EpsilonMatchable(),
                 Matchable(TokenType.SYMBOL, r'\*'),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(\+|-|;|\)|<|==|\]|,)'),
-            ],
+            follow=term_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(2, 3, 'factor'),
                 NonTerminalTransitionInfo(3, 4, 'G',
@@ -836,9 +775,7 @@ def create_transition_diagrams() -> ParserDFA:
                 Matchable(TokenType.ID),
                 Matchable(TokenType.NUM),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(\+|-|;|\)|<|==|\]|,|\*)'),
-            ],
+            follow=factor_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(2, 3, 'expression'),
                 NonTerminalTransitionInfo(5, 4, 'var_call_prime'),
@@ -857,9 +794,7 @@ def create_transition_diagrams() -> ParserDFA:
                 EpsilonMatchable(),
                 Matchable(TokenType.SYMBOL, r'(\(|\[)'),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(\+|-|;|\)|<|==|\]|,|\*)'),
-            ],
+            follow=factor_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(2, 3, 'args', symbols=[ActionSymbol.ArgPass]),
                 NonTerminalTransitionInfo(1, 4, 'var_prime'),
@@ -877,9 +812,7 @@ def create_transition_diagrams() -> ParserDFA:
                 EpsilonMatchable(),
                 Matchable(TokenType.SYMBOL, r'\['),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(\+|-|;|\)|<|==|\]|,|\*)'),
-            ],
+            follow=factor_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(2, 3, 'expression'),
             ],
@@ -899,9 +832,7 @@ def create_transition_diagrams() -> ParserDFA:
                 EpsilonMatchable(),
                 Matchable(TokenType.SYMBOL, r'\('),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(\+|-|;|\)|<|==|\]|,|\*)'),
-            ],
+            follow=factor_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(2, 3, 'args',
                                           symbols=[ActionSymbol.ArgPass]),
@@ -922,9 +853,7 @@ def create_transition_diagrams() -> ParserDFA:
                 Matchable(TokenType.SYMBOL, r'\('),
                 Matchable(TokenType.NUM),
             ],
-            follow=[
-                Matchable(TokenType.SYMBOL, r'(\+|-|;|\)|<|==|\]|,|\*)'),
-            ],
+            follow=factor_follow,
             non_terminal_transitions=[
                 NonTerminalTransitionInfo(2, 3, 'expression'),
             ],
@@ -993,6 +922,10 @@ def create_transition_diagrams() -> ParserDFA:
         ),
     )
 
+
+@lru_cache(maxsize=None)
+def create_transition_diagrams() -> ParserDFA:
+    infos = create_dfa_infos()
     dfas = {
         name: ParserDFA(ParserState(1), name, info.first, info.follow)
         for name, info in infos.items()
@@ -1037,15 +970,16 @@ def create_transition_diagrams() -> ParserDFA:
 
     return dfas['program']
 
+@lru_cache(maxsize=None)
 def create_cminus_dfa() -> DFA:
-    dfa = DFA(State(1))
+    dfa = DFA(ScannerState(1))
     
     def default_resolver(token_type: TokenType) -> Callable[[str], TokenType]:
         return lambda _: token_type
 
     finals = {
         2: default_resolver(TokenType.NUM),
-        3: lambda token: TokenType.KEYWORD if token in KEYWORDS else TokenType.ID,
+        3: lambda token, keywords=KEYWORDS, keyword=TokenType.KEYWORD, id_=TokenType.ID: keyword if token in keywords else id_,
         4: default_resolver(TokenType.SYMBOL),
         5: default_resolver(TokenType.SYMBOL),
         8: default_resolver(TokenType.COMMENT),
@@ -1063,7 +997,7 @@ def create_cminus_dfa() -> DFA:
         elif i in error_states:
             dfa.add_state(ErrorState(i, error_states[i]))
         else:
-            dfa.add_state(State(i))
+            dfa.add_state(ScannerState(i))
 
     ILLEGAL_CHARS = r'[^a-zA-Z0-9;:,\[\]\(\)\{\}\+\-<=\*/\s]'
 
@@ -1102,6 +1036,40 @@ def create_cminus_dfa() -> DFA:
     return dfa
 
 
+class Compiler:
+    """ Compiles C-minus sources, reusing the scanner and parser DFAs across inputs. """
+
+    def __init__(self, config: CodeGenConfig = None) -> None:
+        self._config = config or CodeGenConfig()
+        self._scanner_dfa = create_cminus_dfa()
+        self._parser_dfa = create_transition_diagrams()
+
+    def compile(self, input_path: str, output_directory: str = '') -> None:
+        with open(input_path, 'r') as f:
+            code = f.read()
+
+        SymbolTable.reset()
+        scanner = Scanner(self._scanner_dfa, code, [9, 10])
+        program = NonTerminalTransition(None, self._parser_dfa, 'program')
+
+        with CodeGenErrorLogger(os.path.join(output_directory, 'semantic_errors.txt')):
+            codegen = CodeGenerator(self._config)
+
+            token = scanner.get_next_token()
+            with ParserErrorLogger(os.path.join(output_directory, 'syntax_errors.txt')):
+                try:
+                    tree, _ = program.matches(token)
+                except UnexpectedEOF as e:
+                    tree = e.tree
+
+        with open(os.path.join(output_directory, 'parse_tree.txt'), 'w') as f:
+            f.write(''.join([f'{line}\n' for line in tree.render()]))
+
+        if not CodeGenErrorLogger.instance.any_error:
+            with open(os.path.join(output_directory, 'output.txt'), 'w') as f:
+                print(codegen.export(), file=f)
+
+
 if __name__ == '__main__':
     import argparse
 
@@ -1111,29 +1079,4 @@ if __name__ == '__main__':
 
     args = parser.parse_args()
 
-    with open(args.input, 'r') as f:
-        code = f.read()
-
-    dfa = create_cminus_dfa()
-    scanner = Scanner(dfa, code, [9, 10])
-    parser = create_transition_diagrams()
-    program = NonTerminalTransition(None, parser, 'program')
-
-    with CodeGenErrorLogger(os.path.join(args.output_directory, 'semantic_errors.txt')):
-        codegen = CodeGenerator(CodeGenConfig())
-
-        token = scanner.get_next_token()
-        with ParserErrorLogger(os.path.join(args.output_directory, 'syntax_errors.txt')):
-            try:
-                tree, _ = program.matches(token)
-            except UnexpectedEOF as e:
-                tree = e.tree
-
-    anytree = tree.to_anytree()
-    with open(os.path.join(args.output_directory, 'parse_tree.txt'), 'w') as f:
-        for pre, _, node in RenderTree(anytree):
-            print(f'{pre}{node.name}', file=f)
-
-    if not CodeGenErrorLogger.instance.any_error:
-        with open(os.path.join(args.output_directory, 'output.txt'), 'w') as f:
-            print(codegen.export(), file=f)
+    Compiler().compile(args.input, args.output_directory)